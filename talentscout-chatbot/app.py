@@ -2,11 +2,13 @@ import streamlit as st
 import json
 import re
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Final, Iterator, List, Optional
 import openai
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 import os
+import time
 import uuid
+from collections import deque
 
 # Configure page
 st.set_page_config(
@@ -16,7 +18,7 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-@dataclass
+@dataclass(slots=True)
 class CandidateInfo:
     """Data class to store candidate information"""
     full_name: str = ""
@@ -25,69 +27,185 @@ class CandidateInfo:
     years_experience: str = ""
     desired_positions: str = ""
     current_location: str = ""
-    tech_stack: List[str] = None
-    
-    def __post_init__(self):
-        if self.tech_stack is None:
-            self.tech_stack = []
+    tech_stack: List[str] = field(default_factory=list)
 
+from config import CONFIG
 from llm.llm_client import LLMClient
 from llm.prompt_manager import PromptManager
 from utils.validators import InputValidator
 from utils.data_handler import DataHandler
 
+# Technologies that trigger each category of technical question
+LANG_SET = frozenset({'Python', 'JavaScript', 'Java', 'C++', 'C#'})
+FRAMEWORK_SET = frozenset({'React', 'Angular', 'Vue.js', 'Django', 'Flask'})
+DATABASE_SET = frozenset({'PostgreSQL', 'MySQL', 'MongoDB', 'Redis'})
+CLOUD_SET = frozenset({'AWS', 'Google Cloud', 'Azure', 'Docker', 'Kubernetes'})
+
+LANG_QUESTION = "Can you explain the difference between synchronous and asynchronous programming, and when you would use each approach?"
+FRAMEWORK_QUESTION = "How do you handle state management in your applications, and what patterns do you prefer?"
+DATABASE_QUESTION = "How would you optimize a slow database query, and what tools would you use to identify the bottleneck?"
+CLOUD_QUESTION = "Can you walk me through how you would deploy a web application to production, including considerations for scalability and monitoring?"
+LEARNING_QUESTION = "Describe a time when you had to work with a technology you weren't familiar with. How did you approach learning it?"
+
+DEFAULT_QUESTIONS = (
+    "Can you describe a challenging technical problem you solved recently?",
+    "How do you handle debugging when something isn't working as expected?",
+    "What's your process for learning new technologies?"
+)
+
+COMPLETION_MD: Final[str] = """🎉 **Excellent work!** You've completed all the technical questions.
+
+Thank you for taking the time to go through this screening process. Your responses show great technical knowledge and experience.
+
+**What happens next:**
+- Our technical team will review your responses within 24-48 hours
+- If there's a good match, we'll reach out to schedule a more detailed interview
+- You should hear back from us within 3-5 business days
+
+**Keep an eye on:**
+- Your email for updates and next steps
+- Your phone for potential follow-up calls
+
+Thank you for your interest in opportunities with TalentScout. We're excited about the possibility of working with you!
+
+Feel free to type 'bye' if you'd like to end our conversation, or ask any questions you might have."""
+
+@st.cache_resource
+def get_llm_client() -> LLMClient:
+    """Shared LLM client, built once per process"""
+    return LLMClient()
+
+@st.cache_resource
+def get_prompt_manager() -> PromptManager:
+    """Shared prompt manager, built once per process"""
+    return PromptManager()
+
+@st.cache_resource
+def get_validator() -> InputValidator:
+    """Shared input validator, built once per process"""
+    return InputValidator()
+
+@st.cache_resource
+def get_data_handler() -> DataHandler:
+    """Shared data handler, built once per process"""
+    return DataHandler()
+
 class HiringAssistant:
     """Main chatbot class for handling conversations and LLM interactions"""
     
+    # Personal details collected after the name, in the order they are asked
+    _PERSONAL_FIELDS = ('email', 'phone', 'years_experience', 'desired_positions', 'current_location')
+    
+    # Messages kept verbatim when older history is summarized
+    _SUMMARY_KEEP_RECENT = 6
+    
+    # Most recent messages sent to the LLM as conversation context
+    _RECENT_N = 8
+    
+    # Whole-word phrases that signal the candidate wants to leave
+    _END_RE = re.compile(r'\b(?:bye|goodbye|exit|quit|end|stop|thanks|thank\s+you)\b', re.IGNORECASE)
+    
     def __init__(self):
         self.conversation_ended = False
         self.current_stage = "greeting"
         self.candidate_info = CandidateInfo()
         self.technical_questions = []
         self.conversation_history = []
-        self.llm_client = LLMClient()
-        self.prompt_manager = PromptManager()
-        self.validator = InputValidator()
+        # Each history message serialized once as it is added, so saves only join them
+        self._history_json = []
+        self._recent = deque(maxlen=self._RECENT_N)
+        # LLM-side summary of older turns; the history itself is never rewritten
+        self._summary_message = None
+        self._token_estimate = 0
+        self.llm_client = get_llm_client()
+        self.prompt_manager = get_prompt_manager()
+        self.validator = get_validator()
         self.current_question_index = 0
-        self.data_handler = DataHandler()
+        self._personal_cursor = 0
+        self.data_handler = get_data_handler()
         
-    def initialize_llm(self):
-        """Initialize the LLM client"""
-        self.llm_client.initialize_client()
+        # Stable LLM prompt prefix, kept byte-identical across turns so the
+        # backend can reuse its cached prefill for it
+        self._system_messages = [
+            {"role": "system", "content": self.prompt_manager.get_system_prompt()}
+        ]
+        self._context_stage = None
+        self._context_message = None
+        
+        # Stages without a dedicated handler fall back to the LLM
+        self._stage_handlers = {
+            "greeting": self._handle_greeting_stage,
+            "personal_info": self._handle_personal_info_stage,
+            "tech_stack": self._handle_tech_stack_stage,
+            "technical_questions": self._handle_technical_questions_stage,
+        }
     
     def generate_response(self, user_input: str) -> str:
         """Generate chatbot response based on user input"""
         
+        # Strip once here; stage handlers receive the cleaned input
+        user_input = user_input.strip()
+        
         # Add user input to conversation history
-        self.conversation_history.append({"role": "user", "content": user_input})
+        self._append_history("user", user_input)
         
         # Determine current stage and generate appropriate response
         response = self._process_user_input(user_input)
         
         # Add assistant response to conversation history
-        self.conversation_history.append({"role": "assistant", "content": response})
+        self._append_history("assistant", response)
         
         return response
     
+    def _append_history(self, role: str, content: str):
+        """Append a message to the history, summarizing old turns for the LLM when they grow too large"""
+        message = {"role": role, "content": content}
+        self.conversation_history.append(message)
+        self._history_json.append(json.dumps(message).encode())
+        self._recent.append(message)
+        
+        # Rough estimate of ~4 characters per token
+        self._token_estimate += len(content) // 4
+        if self._token_estimate > 0.8 * CONFIG.CONTEXT_WINDOW:
+            self._summarize_old(len(self.conversation_history) - self._SUMMARY_KEEP_RECENT)
+    
+    def _summarize_old(self, k: int):
+        """Summarize the oldest k history messages for the LLM prompt, leaving the saved history intact"""
+        if k <= 0:
+            return
+        
+        info = self.candidate_info
+        facts = [
+            ("Name", info.full_name),
+            ("Email", info.email),
+            ("Years of experience", info.years_experience),
+            ("Desired positions", info.desired_positions),
+            ("Location", info.current_location),
+            ("Tech stack", ", ".join(info.tech_stack)),
+        ]
+        lines = [f"{label}: {value}" for label, value in facts if value]
+        
+        # Short excerpt of the candidate's own words from the summarized turns
+        candidate_turns = [msg['content'][:80] for msg in self.conversation_history[:k] if msg['role'] == 'user']
+        if candidate_turns:
+            lines.append(f"Earlier candidate replies: {' | '.join(candidate_turns[-5:])}")
+        
+        summary = "SUMMARY OF EARLIER CONVERSATION:\n" + "\n".join(lines)
+        self._summary_message = {"role": "system", "content": summary}
+        # Only turns after the summary still count towards the prompt budget
+        self._token_estimate = sum(len(msg['content']) // 4 for msg in self.conversation_history[k:])
+    
     def _process_user_input(self, user_input: str) -> str:
         """Process user input based on current conversation stage"""
         
-        if self.current_stage == "greeting":
-            return self._handle_greeting_stage(user_input)
-        elif self.current_stage == "personal_info":
-            return self._handle_personal_info_stage(user_input)
-        elif self.current_stage == "tech_stack":
-            return self._handle_tech_stack_stage(user_input)
-        elif self.current_stage == "technical_questions":
-            return self._handle_technical_questions_stage(user_input)
-        else:
-            return self._generate_contextual_response(user_input)
+        handler = self._stage_handlers.get(self.current_stage, self._generate_contextual_response)
+        return handler(user_input)
     
     def _handle_greeting_stage(self, user_input: str) -> str:
         """Handle the initial greeting and name collection"""
         
         # Extract name from input
-        name = user_input.strip()
+        name = user_input
         if len(name) > 2 and not any(char.isdigit() for char in name):
             self.candidate_info.full_name = name
             self.current_stage = "personal_info"
@@ -98,30 +216,18 @@ class HiringAssistant:
     def _handle_personal_info_stage(self, user_input: str) -> str:
         """Handle personal information gathering"""
         
-        # Determine what information we're missing
-        missing_fields = []
-        if not self.candidate_info.email:
-            missing_fields.append('email')
-        if not self.candidate_info.phone:
-            missing_fields.append('phone')
-        if not self.candidate_info.years_experience:
-            missing_fields.append('years_experience')
-        if not self.candidate_info.desired_positions:
-            missing_fields.append('desired_positions')
-        if not self.candidate_info.current_location:
-            missing_fields.append('current_location')
-        
-        if not missing_fields:
+        if self._personal_cursor >= len(self._PERSONAL_FIELDS):
             self.current_stage = "tech_stack"
             return "Perfect! Now, could you tell me about your technical expertise? Please list the main programming languages, frameworks, databases, and tools you work with."
         
         # Process current input based on what we're expecting
-        current_field = missing_fields[0]
+        current_field = self._PERSONAL_FIELDS[self._personal_cursor]
         
         if current_field == 'email':
             is_valid, message = self.validator.validate_email(user_input)
             if is_valid:
-                self.candidate_info.email = user_input.strip()
+                self.candidate_info.email = user_input
+                self._personal_cursor += 1
                 return "Great! What's your phone number?"
             else:
                 return f"That doesn't look like a valid email address. {message}"
@@ -129,7 +235,8 @@ class HiringAssistant:
         elif current_field == 'phone':
             is_valid, message = self.validator.validate_phone(user_input)
             if is_valid:
-                self.candidate_info.phone = user_input.strip()
+                self.candidate_info.phone = user_input
+                self._personal_cursor += 1
                 return "Perfect! How many years of professional experience do you have in technology?"
             else:
                 return f"That doesn't look like a valid phone number. {message}"
@@ -137,17 +244,20 @@ class HiringAssistant:
         elif current_field == 'years_experience':
             is_valid, message = self.validator.validate_experience(user_input)
             if is_valid:
-                self.candidate_info.years_experience = user_input.strip()
+                self.candidate_info.years_experience = user_input
+                self._personal_cursor += 1
                 return "Excellent! What type of positions are you looking for? (e.g., Software Engineer, Data Scientist, DevOps Engineer)"
             else:
                 return f"Please provide a valid number of years. {message}"
         
         elif current_field == 'desired_positions':
-            self.candidate_info.desired_positions = user_input.strip()
+            self.candidate_info.desired_positions = user_input
+            self._personal_cursor += 1
             return "Great! What's your current location or preferred work location?"
         
         elif current_field == 'current_location':
-            self.candidate_info.current_location = user_input.strip()
+            self.candidate_info.current_location = user_input
+            self._personal_cursor += 1
             self.current_stage = "tech_stack"
             return "Perfect! Now, could you tell me about your technical expertise? Please list the main programming languages, frameworks, databases, and tools you work with."
         
@@ -156,15 +266,20 @@ class HiringAssistant:
     def _handle_tech_stack_stage(self, user_input: str) -> str:
         """Handle tech stack identification and analysis"""
         
-        # Extract technologies from user input
-        extracted_techs = self.llm_client.extract_tech_stack(user_input)
+        # Extract technologies and draft questions in one LLM round trip
+        extracted_techs, questions = self.llm_client.extract_and_generate(
+            user_input, self.candidate_info.years_experience
+        )
         
         if extracted_techs:
             self.candidate_info.tech_stack = extracted_techs
             self.current_stage = "technical_questions"
             
-            # Generate technical questions
-            self._generate_technical_questions()
+            # Fall back to the built-in question bank when the LLM gave none
+            if questions:
+                self.technical_questions = questions
+            else:
+                self._generate_technical_questions()
             
             tech_list = ", ".join(extracted_techs)
             return f"Excellent! I can see you work with {tech_list}. That's a great tech stack! Now I'd like to ask you a few technical questions to better understand your expertise. Let's start with the first question:\n\n{self.technical_questions[0] if self.technical_questions else 'Can you tell me about a challenging project you worked on recently?'}"
@@ -184,22 +299,7 @@ class HiringAssistant:
             else:
                 # All questions completed
                 self.current_stage = "complete"
-                return """🎉 **Excellent work!** You've completed all the technical questions.
-
-Thank you for taking the time to go through this screening process. Your responses show great technical knowledge and experience.
-
-**What happens next:**
-- Our technical team will review your responses within 24-48 hours
-- If there's a good match, we'll reach out to schedule a more detailed interview
-- You should hear back from us within 3-5 business days
-
-**Keep an eye on:**
-- Your email for updates and next steps
-- Your phone for potential follow-up calls
-
-Thank you for your interest in opportunities with TalentScout. We're excited about the possibility of working with you!
-
-Feel free to type 'bye' if you'd like to end our conversation, or ask any questions you might have."""
+                return COMPLETION_MD
         
         return "Thank you for your response. Let me continue with the next question."
     
@@ -207,69 +307,84 @@ Feel free to type 'bye' if you'd like to end our conversation, or ask any questi
         """Generate technical questions based on candidate's tech stack"""
         
         if not self.candidate_info.tech_stack:
-            self.technical_questions = [
-                "Can you describe a challenging technical problem you solved recently?",
-                "How do you handle debugging when something isn't working as expected?",
-                "What's your process for learning new technologies?"
-            ]
+            self.technical_questions = list(DEFAULT_QUESTIONS)
             return
         
-        # Generate questions based on experience level and tech stack
-        experience_years = self.candidate_info.years_experience
-        tech_stack = self.candidate_info.tech_stack
+        tech_set = frozenset(self.candidate_info.tech_stack)
         
         questions = []
         
         # Programming language questions
-        if any(lang in tech_stack for lang in ['Python', 'JavaScript', 'Java', 'C++', 'C#']):
-            questions.append("Can you explain the difference between synchronous and asynchronous programming, and when you would use each approach?")
+        if LANG_SET & tech_set:
+            questions.append(LANG_QUESTION)
         
         # Framework questions
-        if any(framework in tech_stack for framework in ['React', 'Angular', 'Vue.js', 'Django', 'Flask']):
-            questions.append("How do you handle state management in your applications, and what patterns do you prefer?")
+        if FRAMEWORK_SET & tech_set:
+            questions.append(FRAMEWORK_QUESTION)
         
         # Database questions
-        if any(db in tech_stack for db in ['PostgreSQL', 'MySQL', 'MongoDB', 'Redis']):
-            questions.append("How would you optimize a slow database query, and what tools would you use to identify the bottleneck?")
+        if DATABASE_SET & tech_set:
+            questions.append(DATABASE_QUESTION)
         
         # Cloud/DevOps questions
-        if any(cloud in tech_stack for cloud in ['AWS', 'Google Cloud', 'Azure', 'Docker', 'Kubernetes']):
-            questions.append("Can you walk me through how you would deploy a web application to production, including considerations for scalability and monitoring?")
+        if CLOUD_SET & tech_set:
+            questions.append(CLOUD_QUESTION)
         
         # General problem-solving question
-        questions.append("Describe a time when you had to work with a technology you weren't familiar with. How did you approach learning it?")
+        questions.append(LEARNING_QUESTION)
         
         # Limit to 3-5 questions
         self.technical_questions = questions[:5]
     
     def _generate_contextual_response(self, user_input: str) -> str:
         """Generate contextual response using LLM"""
+        return self.llm_client.generate_response(self._build_contextual_messages())
+    
+    def uses_llm_for_current_stage(self) -> bool:
+        """Whether the current stage is answered by the LLM rather than a scripted handler"""
+        return self.current_stage not in self._stage_handlers
+    
+    def stream_response(self, user_input: str) -> Iterator[str]:
+        """Stream the LLM reply for the current stage, recording both turns in the history"""
         
-        # Prepare messages for LLM
-        messages = [
-            {"role": "system", "content": self.prompt_manager.get_system_prompt()},
-            {"role": "system", "content": self.prompt_manager.get_conversation_context_prompt(
-                self.conversation_history, self.current_stage
-            )}
-        ]
+        user_input = user_input.strip()
+        self._append_history("user", user_input)
+        
+        parts = []
+        for chunk in self.llm_client.stream_response(self._build_contextual_messages()):
+            parts.append(chunk)
+            yield chunk
+        
+        self._append_history("assistant", "".join(parts))
+    
+    def _build_contextual_messages(self) -> List[Dict[str, str]]:
+        """Assemble the LLM messages for a contextual response"""
         
-        # Add recent conversation history
-        recent_history = self.conversation_history[-4:] if len(self.conversation_history) > 4 else self.conversation_history
-        messages.extend(recent_history)
+        # The stage instruction only changes with the stage, keep it otherwise. It carries
+        # no transcript: the recent window below already holds those turns, kept current
+        if self._context_stage != self.current_stage:
+            self._context_message = {"role": "system", "content": self.prompt_manager.get_stage_instruction_prompt(
+                self.current_stage
+            )}
+            self._context_stage = self.current_stage
         
-        return self.llm_client.generate_response(messages)
+        # Stable prefix first, then any summary of older turns and the recent window
+        messages = self._system_messages + [self._context_message]
+        if self._summary_message:
+            messages.append(self._summary_message)
+        messages.extend(self._recent)
+        return messages
     
     def is_conversation_ending(self, user_input: str) -> bool:
         """Check if user wants to end conversation"""
-        ending_keywords = ["bye", "goodbye", "exit", "quit", "end", "stop", "thanks", "thank you"]
-        return any(keyword in user_input.lower() for keyword in ending_keywords)
+        return bool(self._END_RE.search(user_input))
     
     def save_session_data(self, session_id: str) -> bool:
         """Save current session data securely"""
         return self.data_handler.save_candidate_data(
-            self.candidate_info, 
-            session_id, 
-            self.conversation_history
+            self.candidate_info,
+            session_id,
+            b'[' + b','.join(self._history_json) + b']' if self._history_json else None
         )
     
     def export_session_data(self, session_id: str) -> Optional[str]:
@@ -280,10 +395,67 @@ Feel free to type 'bye' if you'd like to end our conversation, or ask any questi
         """Delete session data (right to erasure)"""
         return self.data_handler.delete_candidate_data(session_id, 'user_request')
 
-def main():
-    """Main Streamlit application"""
-    
-    st.markdown("""
+PROGRESS_STEPS = (
+    "Personal Info", "Experience", "Tech Stack", "Technical Questions", "Complete"
+)
+
+# Repeated export clicks within this window reuse the previous export
+EXPORT_DEBOUNCE_SECONDS = 5
+
+# Index into PROGRESS_STEPS for each conversation stage
+STAGE_STEPS = {
+    "greeting": 0,
+    "personal_info": 0,
+    "experience": 1,
+    "tech_stack": 2,
+    "technical_questions": 3,
+    "complete": 4
+}
+
+# Status badge text and CSS class for each conversation stage
+STAGE_STATUS = {
+    "greeting": ("Gathering Information", "status-gathering"),
+    "personal_info": ("Gathering Information", "status-gathering"),
+    "experience": ("Gathering Information", "status-gathering"),
+    "tech_stack": ("Analyzing Tech Stack", "status-gathering"),
+    "technical_questions": ("Technical Assessment", "status-questions"),
+    "complete": ("Interview Complete", "status-complete")
+}
+
+GREETING_MD: Final[str] = """
+        👋 Hello! Welcome to TalentScout's Hiring Assistant. 
+        
+        I'm here to help streamline your interview process. I'll gather some essential information about your background and ask relevant technical questions based on your expertise.
+        
+        This should take about 5-10 minutes. Ready to get started?
+        
+        **Let's begin with your full name:**
+        """
+
+FAREWELL_MD: Final[str] = """
+                🎉 **Thank you for completing the screening process!**
+                
+                Your information has been successfully recorded and our recruitment team will review your profile carefully.
+                
+                **Next steps:**
+                - ✅ Our team will evaluate your responses within 24-48 hours
+                - 📧 If you're a good fit, we'll contact you within 3-5 business days
+                - 📱 Keep an eye on your email and phone for updates
+                
+                **What happens next?**
+                - Technical review of your responses
+                - Potential follow-up interview scheduling
+                - Reference checks for qualified candidates
+                
+                Thank you for your interest in opportunities with TalentScout. We appreciate the time you've invested in this process!
+                
+                Have a great day and good luck with your job search! 🚀
+                """
+
+@st.cache_data
+def _css() -> str:
+    """Page stylesheet, built once and shared across reruns"""
+    return """
     <style>
     /* Import Google Fonts */
     @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
@@ -472,131 +644,79 @@ def main():
     footer {visibility: hidden;}
     header {visibility: hidden;}
     </style>
-    """, unsafe_allow_html=True)
-    
-    st.markdown('<div class="main-container">', unsafe_allow_html=True)
-    
-    # Header
-    st.markdown('<h1 class="main-header">🎯 TalentScout</h1>', unsafe_allow_html=True)
-    st.markdown('<p class="sub-header">Your AI-powered recruitment companion for seamless candidate screening</p>', unsafe_allow_html=True)
-    
-    # Initialize session state
-    if 'assistant' not in st.session_state:
-        st.session_state.assistant = HiringAssistant()
-        st.session_state.session_id = str(uuid.uuid4())
-    
-    if 'messages' not in st.session_state:
-        st.session_state.messages = []
-        # Add initial greeting
-        greeting = """
-        👋 Hello! Welcome to TalentScout's Hiring Assistant. 
-        
-        I'm here to help streamline your interview process. I'll gather some essential information about your background and ask relevant technical questions based on your expertise.
-        
-        This should take about 5-10 minutes. Ready to get started?
-        
-        **Let's begin with your full name:**
-        """
-        st.session_state.messages.append({"role": "assistant", "content": greeting})
-    
-    progress_steps = [
-        "Personal Info", "Experience", "Tech Stack", "Technical Questions", "Complete"
-    ]
-    
-    current_step = 0
-    if hasattr(st.session_state.assistant, 'current_stage'):
-        stage_mapping = {
-            "greeting": 0,
-            "personal_info": 0,
-            "experience": 1,
-            "tech_stack": 2,
-            "technical_questions": 3,
-            "complete": 4
-        }
-        current_step = stage_mapping.get(st.session_state.assistant.current_stage, 0)
-    
-    st.markdown('<div class="progress-container">', unsafe_allow_html=True)
-    st.markdown("**Interview Progress:**")
-    
-    progress_html = ""
-    for i, step in enumerate(progress_steps):
-        if i < current_step:
-            progress_html += f'<span class="progress-step completed" title="{step}"></span>'
-        elif i == current_step:
-            progress_html += f'<span class="progress-step current" title="{step}"></span>'
-        else:
-            progress_html += f'<span class="progress-step pending" title="{step}"></span>'
-    
-    progress_html += f'<span style="margin-left: 1rem; color: #666; font-size: 0.9rem;">{progress_steps[current_step]}</span>'
-    st.markdown(progress_html, unsafe_allow_html=True)
-    st.markdown('</div>', unsafe_allow_html=True)
-    
-    status_mapping = {
-        "greeting": ("Gathering Information", "status-gathering"),
-        "personal_info": ("Gathering Information", "status-gathering"),
-        "experience": ("Gathering Information", "status-gathering"),
-        "tech_stack": ("Analyzing Tech Stack", "status-gathering"),
-        "technical_questions": ("Technical Assessment", "status-questions"),
-        "complete": ("Interview Complete", "status-complete")
-    }
-    
-    status_text, status_class = status_mapping.get(st.session_state.assistant.current_stage, ("Getting Started", "status-gathering"))
-    st.markdown(f'<span class="status-badge {status_class}">📋 {status_text}</span>', unsafe_allow_html=True)
-    
-    st.markdown('<div class="chat-container">', unsafe_allow_html=True)
+    """
+
+@st.cache_data
+def render_progress(step: int, steps: tuple = PROGRESS_STEPS) -> str:
+    """Progress dots HTML for the given step index"""
+    
+    def _state(i: int) -> str:
+        if i < step:
+            return "completed"
+        if i == step:
+            return "current"
+        return "pending"
+    
+    dots = "".join(
+        f'<span class="progress-step {_state(i)}" title="{name}"></span>' for i, name in enumerate(steps)
+    )
+    return f'{dots}<span style="margin-left: 1rem; color: #666; font-size: 0.9rem;">{steps[step]}</span>'
+
+@st.cache_data
+def render_status_badge(stage: str) -> str:
+    """Status badge HTML for the given conversation stage"""
+    status_text, status_class = STAGE_STATUS.get(stage, ("Getting Started", "status-gathering"))
+    return f'<span class="status-badge {status_class}">📋 {status_text}</span>'
+
+@st.fragment
+def _chat_fragment():
+    """Chat transcript and input; reruns on its own when the candidate sends a message"""
     
-    for message in st.session_state.messages:
-        if message["role"] == "user":
-            st.markdown(f'<div class="user-message">{message["content"]}</div>', unsafe_allow_html=True)
-        else:
-            st.markdown(f'<div class="bot-message">{message["content"]}</div>', unsafe_allow_html=True)
+    assistant = st.session_state.assistant
     
-    st.markdown('</div>', unsafe_allow_html=True)
+    # Reserve the transcript slot above the input so a new message can be
+    # processed before the transcript is drawn, without an extra rerun
+    transcript = st.container()
+    transcript_drawn = False
     
     # Chat input
-    if not st.session_state.assistant.conversation_ended:
+    if not assistant.conversation_ended:
         placeholder_text = "Type your response here..."
-        if st.session_state.assistant.current_stage == "greeting":
+        if assistant.current_stage == "greeting":
             placeholder_text = "Enter your full name..."
-        elif st.session_state.assistant.current_stage == "personal_info":
+        elif assistant.current_stage == "personal_info":
             placeholder_text = "Provide the requested information..."
         
         user_input = st.chat_input(placeholder_text)
         
         if user_input:
+            stage_before = assistant.current_stage
+            
             # Add user message to chat
             st.session_state.messages.append({"role": "user", "content": user_input})
             
             # Check if conversation should end
-            if st.session_state.assistant.is_conversation_ending(user_input):
-                st.session_state.assistant.conversation_ended = True
-                st.session_state.assistant.current_stage = "complete"
-                farewell = """
-                🎉 **Thank you for completing the screening process!**
-                
-                Your information has been successfully recorded and our recruitment team will review your profile carefully.
-                
-                **Next steps:**
-                - ✅ Our team will evaluate your responses within 24-48 hours
-                - 📧 If you're a good fit, we'll contact you within 3-5 business days
-                - 📱 Keep an eye on your email and phone for updates
-                
-                **What happens next?**
-                - Technical review of your responses
-                - Potential follow-up interview scheduling
-                - Reference checks for qualified candidates
-                
-                Thank you for your interest in opportunities with TalentScout. We appreciate the time you've invested in this process!
-                
-                Have a great day and good luck with your job search! 🚀
-                """
-                st.session_state.messages.append({"role": "assistant", "content": farewell})
+            if assistant.is_conversation_ending(user_input):
+                assistant.conversation_ended = True
+                assistant.current_stage = "complete"
+                st.session_state.messages.append({"role": "assistant", "content": FAREWELL_MD})
+            elif assistant.uses_llm_for_current_stage():
+                # Draw the transcript so far and stream the LLM reply beneath it
+                with transcript:
+                    _render_transcript()
+                    with st.chat_message("assistant"):
+                        response = st.write_stream(assistant.stream_response(user_input))
+                transcript_drawn = True
+                st.session_state.messages.append({"role": "assistant", "content": response})
             else:
-                # Generate response (placeholder for now)
-                response = st.session_state.assistant.generate_response(user_input)
+                response = assistant.generate_response(user_input)
                 st.session_state.messages.append({"role": "assistant", "content": response})
             
-            st.rerun()
+            # Progress and status live outside the fragment and only change with the stage;
+            # the sidebar dashboard, when shown, reflects every message and collected field
+            if (assistant.conversation_ended or assistant.current_stage != stage_before
+                    or st.session_state.get("_sidebar_open")):
+                st.rerun()
     else:
         st.success("🎉 Interview completed successfully!")
         st.info("💡 **Tip:** Refresh the page to start a new screening session.")
@@ -608,31 +728,94 @@ def main():
                     del st.session_state[key]
                 st.rerun()
     
+    if not transcript_drawn:
+        with transcript:
+            _render_transcript()
+
+def _render_transcript():
+    """Draw the chat messages recorded in the session"""
+    
+    st.markdown('<div class="chat-container">', unsafe_allow_html=True)
+    
+    for message in st.session_state.messages:
+        if message["role"] == "user":
+            st.markdown(f'<div class="user-message">{message["content"]}</div>', unsafe_allow_html=True)
+        else:
+            st.markdown(f'<div class="bot-message">{message["content"]}</div>', unsafe_allow_html=True)
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+
+@st.fragment
+def _render_dashboard():
+    """Session and candidate summary shown when the dashboard toggle is on"""
+    
+    # Session info
+    st.subheader("Current Session")
+    st.write(f"**Stage:** {st.session_state.assistant.current_stage.replace('_', ' ').title()}")
+    st.write(f"**Status:** {'Completed' if st.session_state.assistant.conversation_ended else 'In Progress'}")
+    st.write(f"**Messages:** {len(st.session_state.messages)}")
+    
+    # Candidate info preview (if available)
+    if hasattr(st.session_state.assistant, 'candidate_info'):
+        candidate = st.session_state.assistant.candidate_info
+        st.subheader("📝 Collected Information")
+        
+        if candidate.full_name:
+            st.write(f"**Name:** {candidate.full_name}")
+        if candidate.email:
+            st.write(f"**Email:** {candidate.email}")
+        if candidate.years_experience:
+            st.write(f"**Experience:** {candidate.years_experience} years")
+        if candidate.tech_stack:
+            st.write(f"**Tech Stack:** {', '.join(candidate.tech_stack[:3])}{'...' if len(candidate.tech_stack) > 3 else ''}")
+
+def main():
+    """Main Streamlit application"""
+    
+    # Streamlit drops elements that are not re-emitted on a rerun, so the
+    # stylesheet is injected every time; only building it is cached
+    st.markdown(_css(), unsafe_allow_html=True)
+    
+    st.markdown('<div class="main-container">', unsafe_allow_html=True)
+    
+    # Header
+    st.markdown('<h1 class="main-header">🎯 TalentScout</h1>', unsafe_allow_html=True)
+    st.markdown('<p class="sub-header">Your AI-powered recruitment companion for seamless candidate screening</p>', unsafe_allow_html=True)
+    
+    # Initialize session state
+    if 'assistant' not in st.session_state:
+        st.session_state.assistant = HiringAssistant()
+        st.session_state.session_id = str(uuid.uuid4())
+    
+    if 'messages' not in st.session_state:
+        st.session_state.messages = []
+        # Add initial greeting
+        st.session_state.messages.append({"role": "assistant", "content": GREETING_MD})
+    
+    current_step = 0
+    if hasattr(st.session_state.assistant, 'current_stage'):
+        current_step = STAGE_STEPS.get(st.session_state.assistant.current_stage, 0)
+    
+    st.markdown('<div class="progress-container">', unsafe_allow_html=True)
+    st.markdown("**Interview Progress:**")
+    
+    st.markdown(render_progress(current_step), unsafe_allow_html=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    st.markdown(render_status_badge(st.session_state.assistant.current_stage), unsafe_allow_html=True)
+    
+    _chat_fragment()
+    
     st.markdown('</div>', unsafe_allow_html=True)
     
     with st.sidebar:
         st.markdown('<div class="sidebar-content">', unsafe_allow_html=True)
         st.header("📊 Session Dashboard")
         
-        # Session info
-        st.subheader("Current Session")
-        st.write(f"**Stage:** {st.session_state.assistant.current_stage.replace('_', ' ').title()}")
-        st.write(f"**Status:** {'Completed' if st.session_state.assistant.conversation_ended else 'In Progress'}")
-        st.write(f"**Messages:** {len(st.session_state.messages)}")
-        
-        # Candidate info preview (if available)
-        if hasattr(st.session_state.assistant, 'candidate_info'):
-            candidate = st.session_state.assistant.candidate_info
-            st.subheader("📝 Collected Information")
-            
-            if candidate.full_name:
-                st.write(f"**Name:** {candidate.full_name}")
-            if candidate.email:
-                st.write(f"**Email:** {candidate.email}")
-            if candidate.years_experience:
-                st.write(f"**Experience:** {candidate.years_experience} years")
-            if candidate.tech_stack:
-                st.write(f"**Tech Stack:** {', '.join(candidate.tech_stack[:3])}{'...' if len(candidate.tech_stack) > 3 else ''}")
+        # The dashboard and info panels are only built when the candidate asks for them
+        show_dashboard = st.toggle("Show dashboard", key="_sidebar_open")
+        if show_dashboard:
+            _render_dashboard()
         
         st.divider()
         
@@ -645,11 +828,19 @@ def main():
         
         if st.button("💾 Export Data", use_container_width=True):
             if hasattr(st.session_state, 'session_id'):
-                # Save current session first
-                st.session_state.assistant.save_session_data(st.session_state.session_id)
+                # Reuse an export made moments ago instead of re-saving on repeated clicks
+                last_export = st.session_state.get('_last_export_at')
+                if last_export and time.monotonic() - last_export[0] < EXPORT_DEBOUNCE_SECONDS:
+                    export_file = last_export[1]
+                else:
+                    # Save current session first; the export reads the saved file
+                    st.session_state.assistant.save_session_data(st.session_state.session_id)
+                    
+                    # Export data
+                    export_file = st.session_state.assistant.export_session_data(st.session_state.session_id)
+                    if export_file:
+                        st.session_state['_last_export_at'] = (time.monotonic(), export_file)
                 
-                # Export data
-                export_file = st.session_state.assistant.export_session_data(st.session_state.session_id)
                 if export_file:
                     st.success("✅ Data exported successfully!")
                     st.info(f"📁 Export saved to: {export_file}")
@@ -689,48 +880,49 @@ def main():
         
         st.markdown('</div>', unsafe_allow_html=True)
         
-        with st.expander("🔒 Privacy & Data Protection"):
-            st.markdown("""
-            **Your Privacy Matters:**
-            
-            🔐 **Data Encryption:** All personal information is encrypted at rest
-            
-            🕒 **Retention Policy:** Data is automatically deleted after 30 days
-            
-            📋 **Your Rights (GDPR):**
-            - **Access:** View your stored data
-            - **Portability:** Export your data
-            - **Erasure:** Delete your data anytime
-            - **Rectification:** Correct inaccurate data
-            
-            **What We Collect:**
-            - Contact information (encrypted)
-            - Professional experience
-            - Technical skills
-            - Interview responses
-            
-            **Data Usage:**
-            - Initial candidate screening only
-            - No sharing with third parties
-            - Secure processing and storage
-            
-            **Contact:** privacy@talentscout.com
-            """)
-        
-        with st.expander("❓ Help & Tips"):
-            st.markdown("""
-            **How to use TalentScout:**
-            
-            1. **Be honest** - Provide accurate information
-            2. **Be specific** - Detail your tech stack clearly  
-            3. **Take your time** - No rush, think through answers
-            4. **Ask questions** - Feel free to clarify anything
+        if show_dashboard:
+            with st.expander("🔒 Privacy & Data Protection"):
+                st.markdown("""
+                **Your Privacy Matters:**
+                
+                🔐 **Data Encryption:** All personal information is encrypted at rest
+                
+                🕒 **Retention Policy:** Data is automatically deleted after 30 days
+                
+                📋 **Your Rights (GDPR):**
+                - **Access:** View your stored data
+                - **Portability:** Export your data
+                - **Erasure:** Delete your data anytime
+                - **Rectification:** Correct inaccurate data
+                
+                **What We Collect:**
+                - Contact information (encrypted)
+                - Professional experience
+                - Technical skills
+                - Interview responses
+                
+                **Data Usage:**
+                - Initial candidate screening only
+                - No sharing with third parties
+                - Secure processing and storage
+                
+                **Contact:** privacy@talentscout.com
+                """)
             
-            **Technical Issues?**
-            - Refresh the page if something seems stuck
-            - Use the Reset Session button to start over
-            - Contact support if problems persist
-            """)
+            with st.expander("❓ Help & Tips"):
+                st.markdown("""
+                **How to use TalentScout:**
+                
+                1. **Be honest** - Provide accurate information
+                2. **Be specific** - Detail your tech stack clearly  
+                3. **Take your time** - No rush, think through answers
+                4. **Ask questions** - Feel free to clarify anything
+                
+                **Technical Issues?**
+                - Refresh the page if something seems stuck
+                - Use the Reset Session button to start over
+                - Contact support if problems persist
+                """)
 
 if __name__ == "__main__":
     main()
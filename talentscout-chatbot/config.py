@@ -1,43 +1,94 @@
 import os
+from functools import cache, cached_property
+from types import MappingProxyType
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+@cache
+def _environment() -> dict:
+    """Load .env on first setting access and snapshot the process environment once"""
+    load_dotenv()
+    return dict(os.environ)
+
+def _env(name: str, default=None):
+    return _environment().get(name, default)
 
 class Config:
     """Configuration class for the application"""
     
     # API Keys
-    OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
+    @cached_property
+    def OPENAI_API_KEY(self):
+        return _env('OPENAI_API_KEY')
     
     # Application Settings
-    APP_NAME = os.getenv('APP_NAME', 'TalentScout Hiring Assistant')
-    DEBUG_MODE = os.getenv('DEBUG_MODE', 'False').lower() == 'true'
+    @cached_property
+    def APP_NAME(self):
+        return _env('APP_NAME', 'TalentScout Hiring Assistant')
+    
+    @cached_property
+    def DEBUG_MODE(self):
+        return _env('DEBUG_MODE', 'False').lower() == 'true'
+    
+    # LLM Settings
+    @cached_property
+    def CONTEXT_WINDOW(self):
+        return int(_env('CONTEXT_WINDOW', '4096'))
+    
+    @cached_property
+    def LLM_CACHE_PATH(self):
+        return _env('LLM_CACHE_PATH', 'data/llm_cache.db')
+    
+    @cached_property
+    def LLM_CACHE_TTL_HOURS(self):
+        return int(_env('LLM_CACHE_TTL_HOURS', '24'))
     
     # Data Privacy
-    ENCRYPT_DATA = os.getenv('ENCRYPT_DATA', 'True').lower() == 'true'
-    DATA_RETENTION_DAYS = int(os.getenv('DATA_RETENTION_DAYS', '30'))
+    @cached_property
+    def ENCRYPT_DATA(self):
+        return _env('ENCRYPT_DATA', 'True').lower() == 'true'
+    
+    @cached_property
+    def DATA_RETENTION_DAYS(self):
+        return int(_env('DATA_RETENTION_DAYS', '30'))
     
-    # Tech Stack Categories
-    TECH_CATEGORIES = {
-        'programming_languages': [
+    # Tech Stack Categories (read-only; the matchers in llm_client are built from them once)
+    TECH_CATEGORIES = MappingProxyType({
+        'programming_languages': (
             'Python', 'JavaScript', 'Java', 'C++', 'C#', 'Go', 'Rust', 
             'TypeScript', 'PHP', 'Ruby', 'Swift', 'Kotlin', 'Scala'
-        ],
-        'frameworks': [
+        ),
+        'frameworks': (
             'React', 'Angular', 'Vue.js', 'Django', 'Flask', 'FastAPI',
             'Spring Boot', 'Express.js', 'Next.js', 'Laravel', 'Rails'
-        ],
-        'databases': [
+        ),
+        'databases': (
             'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'SQLite',
             'Oracle', 'Cassandra', 'DynamoDB', 'Elasticsearch'
-        ],
-        'cloud_platforms': [
+        ),
+        'cloud_platforms': (
             'AWS', 'Google Cloud', 'Azure', 'Heroku', 'Vercel',
             'Netlify', 'DigitalOcean', 'Kubernetes', 'Docker'
-        ],
-        'tools': [
+        ),
+        'tools': (
             'Git', 'Jenkins', 'Docker', 'Kubernetes', 'Terraform',
             'Ansible', 'Prometheus', 'Grafana', 'Jira', 'Confluence'
-        ]
-    }
+        )
+    })
+    
+    # Flattened views of TECH_CATEGORIES, computed once at class creation
+    ALL_TECHS = tuple(dict.fromkeys(tech for techs in TECH_CATEGORIES.values() for tech in techs))
+    ALL_TECHS_JOINED = ', '.join(ALL_TECHS)
+    TECH_VARIATIONS = tuple(
+        (variation, tech)
+        for tech in ALL_TECHS
+        for lowered in (tech.lower(),)
+        for variation in dict.fromkeys((
+            lowered,
+            lowered.replace('.', '') if '.' in lowered else lowered,
+            lowered.replace(' ', '') if ' ' in lowered else lowered,
+            lowered.replace('-', '') if '-' in lowered else lowered,
+        ))
+    )
+
+# Shared instance; each environment setting is read once, on first access
+CONFIG = Config()
@@ -1,29 +1,85 @@
 import openai
-from typing import List, Dict, Optional
-from config import Config
+import httpx
+from functools import cached_property
+from importlib.util import find_spec
+from typing import List, Dict, Iterator, Optional, Tuple
+from config import CONFIG
+from llm.prompt_manager import PromptManager
+from llm.response_cache import ResponseCache
+from utils.validators import iter_whole_word_matches
 import json
 import re
 
+# HTTP/2 needs the optional h2 package (installed by httpx[http2])
+_HTTP2 = find_spec('h2') is not None
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20)
+
+try:
+    import ahocorasick
+except ImportError:
+    # Optional accelerator; extract_tech_stack falls back to a compiled regex
+    ahocorasick = None
+
+def _build_tech_automaton():
+    """Aho-Corasick automaton over every tech-name variation"""
+    automaton = ahocorasick.Automaton()
+    for variation, tech in CONFIG.TECH_VARIATIONS:
+        automaton.add_word(variation, (len(variation), tech))
+    automaton.make_automaton()
+    return automaton
+
+def _build_tech_regex():
+    """One alternation over every variation, longest first so Java cannot mask JavaScript"""
+    variations = sorted((variation for variation, _ in CONFIG.TECH_VARIATIONS), key=len, reverse=True)
+    # Lookarounds instead of \b so names ending in symbols (C++, C#) still match
+    return re.compile(r'(?<!\w)(?:' + '|'.join(map(re.escape, variations)) + r')(?!\w)')
+
+# Built once at import so every chat turn shares the same matchers
+_TECH_AUTOMATON = _build_tech_automaton() if ahocorasick is not None else None
+_TECH_REGEX = _build_tech_regex()
+_VARIATION_TO_TECH = dict(CONFIG.TECH_VARIATIONS)
+_MIN_VARIATION_LEN = min(len(variation) for variation in _VARIATION_TO_TECH)
+
+# Keyword groups the mock responder looks for, one compiled scan per group
+_MOCK_PATTERNS = {
+    'digit': re.compile(r'\d'),
+    'years': re.compile(r'year|[1-9]'),
+    'roles': re.compile(r'engineer|developer|scientist|analyst|manager'),
+    'location': re.compile(r'city|remote|location|state|country'),
+    'tech': re.compile(r'python|javascript|java|react|node|sql|aws|docker'),
+}
+
 class LLMClient:
     """Client for interacting with OpenAI's API"""
     
+    MODEL = "gpt-3.5-turbo"
+    
     def __init__(self):
-        self.config = Config()
-        self.client = None
-        self.initialize_client()
+        self.prompt_manager = PromptManager()
     
-    def initialize_client(self):
-        """Initialize the OpenAI client"""
+    # Built on first use, so callers that only extract tech stacks never create it
+    @cached_property
+    def client(self) -> Optional[openai.OpenAI]:
+        """Sync OpenAI client, or None to use mock responses"""
+        if not CONFIG.OPENAI_API_KEY:
+            print("Warning: OpenAI API key not found. Using mock responses.")
+            return None
         try:
-            if self.config.OPENAI_API_KEY:
-                openai.api_key = self.config.OPENAI_API_KEY
-                self.client = openai
-            else:
-                print("Warning: OpenAI API key not found. Using mock responses.")
-                self.client = None
+            # Persistent pooled connections so each turn skips the TCP/TLS handshake
+            return openai.OpenAI(
+                api_key=CONFIG.OPENAI_API_KEY,
+                http_client=httpx.Client(http2=_HTTP2, limits=_HTTP_LIMITS)
+            )
         except Exception as e:
             print(f"Error initializing OpenAI client: {e}")
-            self.client = None
+            return None
+    
+    @cached_property
+    def response_cache(self) -> Optional[ResponseCache]:
+        """Persistent response cache, only used with a real API key"""
+        if not CONFIG.OPENAI_API_KEY:
+            return None
+        return ResponseCache(CONFIG.LLM_CACHE_PATH, CONFIG.LLM_CACHE_TTL_HOURS * 3600)
     
     def generate_response(self, messages: List[Dict[str, str]], max_tokens: int = 300, temperature: float = 0.7) -> str:
         """Generate response using OpenAI API"""
@@ -32,8 +88,8 @@ class LLMClient:
             return self._get_mock_response(messages)
         
         try:
-            response = self.client.ChatCompletion.create(
-                model="gpt-3.5-turbo",
+            response = self.client.chat.completions.create(
+                model=self.MODEL,
                 messages=messages,
                 max_tokens=max_tokens,
                 temperature=temperature,
@@ -47,34 +103,102 @@ class LLMClient:
             print(f"Error generating response: {e}")
             return self._get_fallback_response()
     
+    def stream_response(self, messages: List[Dict[str, str]], max_tokens: int = 300, temperature: float = 0.7) -> Iterator[str]:
+        """Yield the response text as it arrives from the OpenAI API"""
+        
+        if not self.client:
+            yield self._get_mock_response(messages)
+            return
+        
+        parts = []
+        try:
+            stream = self.client.chat.completions.create(
+                model=self.MODEL,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                presence_penalty=0.1,
+                frequency_penalty=0.1,
+                stream=True
+            )
+            
+            for chunk in stream:
+                delta = getattr(chunk.choices[0].delta, 'content', None) if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield delta
+            
+        except Exception as e:
+            print(f"Error streaming response: {e}")
+            if not parts:
+                yield self._get_fallback_response()
+    
+    def extract_and_generate(self, user_input: str, experience: str) -> Tuple[List[str], List[str]]:
+        """Extract the tech stack and generate technical questions in a single request"""
+        
+        if not self.client:
+            return self.extract_tech_stack(user_input), []
+        
+        messages = [
+            {"role": "system", "content": self.prompt_manager.get_system_prompt()},
+            {"role": "user", "content": self.prompt_manager.get_tech_stack_and_questions_prompt(user_input, experience)}
+        ]
+        # The only cached call: its reply is a tech list and generic questions, with no personal details
+        cache_key = ResponseCache.make_key(self.MODEL, 0.3, messages, max_tokens=600, response_format='json_object')
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached[0], cached[1]
+        
+        try:
+            response = self.client.chat.completions.create(
+                model=self.MODEL,
+                messages=messages,
+                max_tokens=600,
+                temperature=0.3,
+                response_format={"type": "json_object"}
+            )
+            
+            result = json.loads(response.choices[0].message.content)
+            tech_stack = [tech for tech in result.get('tech_stack', []) if isinstance(tech, str) and tech.strip()]
+            questions = [q for q in result.get('questions', []) if isinstance(q, str) and q.strip()]
+            
+            if tech_stack:
+                self._set_cached(cache_key, [tech_stack, questions[:5]])
+                return tech_stack, questions[:5]
+            
+        except Exception as e:
+            print(f"Error extracting tech stack: {e}")
+        
+        # Fall back to keyword matching; the caller picks questions locally
+        return self.extract_tech_stack(user_input), []
+    
     def extract_tech_stack(self, user_input: str) -> List[str]:
         """Extract mentioned technologies from user input"""
         
-        found_techs = []
+        # Inputs shorter than every tech name cannot mention one
+        if len(user_input) < _MIN_VARIATION_LEN:
+            return []
+        
+        # Lowercase the input once; the variations are already lowercase
         user_input_lower = user_input.lower()
         
-        # Get all available technologies
-        all_techs = []
-        for category, techs in self.config.TECH_CATEGORIES.items():
-            all_techs.extend(techs)
-        
-        # Find mentioned technologies
-        for tech in all_techs:
-            # Check for exact matches and common variations
-            tech_variations = [
-                tech.lower(),
-                tech.lower().replace('.', ''),
-                tech.lower().replace(' ', ''),
-                tech.lower().replace('-', ''),
-            ]
-            
-            for variation in tech_variations:
-                if variation in user_input_lower:
-                    if tech not in found_techs:
-                        found_techs.append(tech)
-                    break
+        if _TECH_AUTOMATON is not None:
+            # One linear pass finds every variation; keep only whole-word hits
+            mentioned = set(iter_whole_word_matches(_TECH_AUTOMATON, user_input_lower))
+        else:
+            mentioned = {_VARIATION_TO_TECH[match] for match in _TECH_REGEX.findall(user_input_lower)}
         
-        return found_techs
+        # Report matches in catalogue order
+        return [tech for tech in CONFIG.ALL_TECHS if tech in mentioned]
+    
+    def _get_cached(self, cache_key: str):
+        """Look up a cached response, if caching is enabled"""
+        return self.response_cache.get(cache_key) if self.response_cache else None
+    
+    def _set_cached(self, cache_key: str, value):
+        """Store a response in the cache, if caching is enabled"""
+        if self.response_cache:
+            self.response_cache.set(cache_key, value)
     
     def _get_mock_response(self, messages: List[Dict[str, str]]) -> str:
         """Generate mock responses when API is not available"""
@@ -88,19 +212,19 @@ class LLMClient:
         elif "@" in last_message:
             return "Great! What's your phone number?"
         
-        elif any(char.isdigit() for char in last_message) and ("phone" in messages[-2]['content'].lower() if len(messages) > 1 else False):
+        elif _MOCK_PATTERNS['digit'].search(last_message) and ("phone" in messages[-2]['content'].lower() if len(messages) > 1 else False):
             return "Perfect! How many years of professional experience do you have in technology?"
         
-        elif "year" in last_message or any(word in last_message for word in ["1", "2", "3", "4", "5", "6", "7", "8", "9"]):
+        elif _MOCK_PATTERNS['years'].search(last_message):
             return "Excellent! What type of positions are you looking for? (e.g., Software Engineer, Data Scientist, DevOps Engineer)"
         
-        elif any(word in last_message for word in ["engineer", "developer", "scientist", "analyst", "manager"]):
+        elif _MOCK_PATTERNS['roles'].search(last_message):
             return "Great! What's your current location or preferred work location?"
         
-        elif any(word in last_message for word in ["city", "remote", "location", "state", "country"]):
+        elif _MOCK_PATTERNS['location'].search(last_message):
             return "Perfect! Now, could you tell me about your technical expertise? Please list the main programming languages, frameworks, databases, and tools you work with."
         
-        elif any(tech.lower() in last_message for tech in ["python", "javascript", "java", "react", "node", "sql", "aws", "docker"]):
+        elif _MOCK_PATTERNS['tech'].search(last_message):
             return "Excellent tech stack! Now I'd like to ask you a few technical questions to better understand your expertise. Let's start with: Can you explain the difference between synchronous and asynchronous programming, and when you would use each approach?"
         
         else:
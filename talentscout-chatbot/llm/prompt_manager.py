@@ -1,15 +1,11 @@
-from typing import List, Dict, Any
-from config import Config
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
+from types import MappingProxyType
+from typing import List, Dict, Any, Sequence
+from config import CONFIG
 
-class PromptManager:
-    """Manages prompts for different conversation stages"""
-    
-    def __init__(self):
-        self.config = Config()
-    
-    def get_system_prompt(self) -> str:
-        """Get the main system prompt for the hiring assistant"""
-        return """You are TalentScout's AI Hiring Assistant, a professional and friendly recruitment chatbot specializing in technology placements. Your role is to conduct initial candidate screening through natural conversation.
+_SYSTEM_PROMPT = """You are TalentScout's AI Hiring Assistant, a professional and friendly recruitment chatbot specializing in technology placements. Your role is to conduct initial candidate screening through natural conversation.
 
 CORE RESPONSIBILITIES:
 1. Gather essential candidate information (name, email, phone, experience, location, desired positions)
@@ -38,49 +34,61 @@ IMPORTANT GUIDELINES:
 
 TONE: Professional yet friendly, encouraging, efficient but not rushed."""
 
+_STAGE_INSTRUCTIONS = MappingProxyType({
+    'greeting': 'You are in the greeting stage. Welcome the candidate and start gathering basic information.',
+    'personal_info': 'You are gathering personal information. Ask for missing details one at a time.',
+    'experience': 'You are learning about their experience and desired positions.',
+    'tech_stack': 'You are identifying their technical expertise and skills.',
+    'technical_questions': 'You are asking technical questions based on their declared expertise.',
+    'complete': 'The screening is complete. Provide next steps and conclude professionally.'
+})
+
+_FIELD_QUESTIONS = MappingProxyType({
+    'full_name': "Could you please tell me your full name?",
+    'email': "What's your email address?",
+    'phone': "Could you provide your phone number?",
+    'years_experience': "How many years of professional experience do you have in technology?",
+    'desired_positions': "What type of positions are you looking for? (e.g., Software Engineer, Data Scientist, etc.)",
+    'current_location': "What's your current location or preferred work location?",
+    'tech_stack': "Could you tell me about your technical expertise? Please list the main programming languages, frameworks, databases, and tools you work with."
+})
+
+@lru_cache(maxsize=256)
+def _build_information_gathering_prompt(next_field: str, has_collected: bool) -> str:
+    """Question for the next missing field, prefixed with thanks once something is collected"""
+    question = _FIELD_QUESTIONS.get(next_field, "Could you provide more information?")
+    context = "Thanks for the information so far. " if has_collected else ""
+    return f"{context}{question}"
+
+# Speaker label for a message role; anything other than the candidate is the assistant
+_ROLE_LABEL = {'user': 'Candidate'}.get
+_ROLE_AND_CONTENT = itemgetter('role', 'content')
+
+class PromptManager:
+    """Manages prompts for different conversation stages"""
+    
+    def get_system_prompt(self) -> str:
+        """Get the main system prompt for the hiring assistant"""
+        return _SYSTEM_PROMPT
+
     def get_information_gathering_prompt(self, missing_fields: List[str], candidate_info: Dict) -> str:
         """Generate prompt for gathering missing candidate information"""
         
-        field_questions = {
-            'full_name': "Could you please tell me your full name?",
-            'email': "What's your email address?",
-            'phone': "Could you provide your phone number?",
-            'years_experience': "How many years of professional experience do you have in technology?",
-            'desired_positions': "What type of positions are you looking for? (e.g., Software Engineer, Data Scientist, etc.)",
-            'current_location': "What's your current location or preferred work location?",
-            'tech_stack': "Could you tell me about your technical expertise? Please list the main programming languages, frameworks, databases, and tools you work with."
-        }
-        
         if not missing_fields:
             return "Great! I have all your basic information. Now let's move on to some technical questions."
         
-        next_field = missing_fields[0]
-        question = field_questions.get(next_field, "Could you provide more information?")
-        
-        # Add context about what we already have
-        collected_info = []
-        for field, value in candidate_info.items():
-            if value and field != 'tech_stack':
-                collected_info.append(f"{field.replace('_', ' ').title()}: {value}")
-        
-        context = ""
-        if collected_info:
-            context = f"Thanks for the information so far. "
-        
-        return f"{context}{question}"
+        # Only whether anything besides the tech stack is collected affects the wording
+        has_collected = any(value for field, value in candidate_info.items() if field != 'tech_stack')
+        return _build_information_gathering_prompt(missing_fields[0], has_collected)
 
     def get_tech_stack_analysis_prompt(self, tech_input: str) -> str:
         """Generate prompt to analyze and extract tech stack from user input"""
         
-        all_techs = []
-        for category, techs in self.config.TECH_CATEGORIES.items():
-            all_techs.extend(techs)
-        
         return f"""Analyze the following text and extract mentioned technologies, frameworks, databases, and tools. 
         
 User input: "{tech_input}"
 
-Available technologies to match against: {', '.join(all_techs)}
+Available technologies to match against: {CONFIG.ALL_TECHS_JOINED}
 
 Please:
 1. Identify all mentioned technologies from the available list
@@ -114,25 +122,45 @@ Present the questions in a friendly, conversational manner. Introduce them by sa
 
 Ask questions one at a time, waiting for responses before moving to the next question."""
 
-    def get_conversation_context_prompt(self, conversation_history: List[Dict], current_stage: str) -> str:
-        """Generate context-aware prompt based on conversation history"""
+    def get_tech_stack_and_questions_prompt(self, tech_input: str, experience_level: str) -> str:
+        """Single prompt that extracts the tech stack and drafts technical questions as JSON"""
         
-        recent_messages = conversation_history[-6:] if len(conversation_history) > 6 else conversation_history
+        return f"""A candidate with {experience_level or 'an unspecified number of'} years of experience described their technical expertise as:
+
+"{tech_input}"
+
+Known technologies: {CONFIG.ALL_TECHS_JOINED}
+
+Respond with a JSON object with exactly two keys:
+- "tech_stack": list of the technologies the candidate mentioned, using the spelling from the known list where one matches
+- "questions": list of 3-5 technical questions tailored to those technologies and to their experience level
+
+QUESTION GUIDELINES:
+- Mix of conceptual and practical questions
+- Cover different technologies they mentioned
+- Include at least one problem-solving scenario
+- Avoid overly complex or trick questions
+- Phrase each question conversationally, as a single self-contained question
+
+If no technologies are mentioned, return empty lists."""
+
+    def get_conversation_context_prompt(self, conversation_history: Sequence[Dict], current_stage: str) -> str:
+        """Generate context-aware prompt based on conversation history (a list or bounded deque)"""
         
-        context = "RECENT CONVERSATION:\n"
-        for msg in recent_messages:
-            role = "Candidate" if msg['role'] == 'user' else "Assistant"
-            context += f"{role}: {msg['content']}\n"
+        # Iterate the last six messages in place rather than copying a slice
+        recent_messages = islice(conversation_history, max(0, len(conversation_history) - 6), None)
         
-        stage_instructions = {
-            'greeting': 'You are in the greeting stage. Welcome the candidate and start gathering basic information.',
-            'personal_info': 'You are gathering personal information. Ask for missing details one at a time.',
-            'experience': 'You are learning about their experience and desired positions.',
-            'tech_stack': 'You are identifying their technical expertise and skills.',
-            'technical_questions': 'You are asking technical questions based on their declared expertise.',
-            'complete': 'The screening is complete. Provide next steps and conclude professionally.'
-        }
+        context = "RECENT CONVERSATION:\n" + "".join([
+            f"{_ROLE_LABEL(role, 'Assistant')}: {content}\n" for role, content in map(_ROLE_AND_CONTENT, recent_messages)
+        ])
         
-        instruction = stage_instructions.get(current_stage, 'Continue the conversation naturally.')
+        instruction = _STAGE_INSTRUCTIONS.get(current_stage, 'Continue the conversation naturally.')
         
         return f"{context}\nCURRENT STAGE: {current_stage}\nINSTRUCTION: {instruction}\n\nRespond naturally and conversationally based on the context above."
+    
+    def get_stage_instruction_prompt(self, current_stage: str) -> str:
+        """Stage instruction alone, for callers that send the recent messages themselves"""
+        
+        instruction = _STAGE_INSTRUCTIONS.get(current_stage, 'Continue the conversation naturally.')
+        
+        return f"CURRENT STAGE: {current_stage}\nINSTRUCTION: {instruction}\n\nRespond naturally and conversationally based on the conversation that follows."
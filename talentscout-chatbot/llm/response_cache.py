@@ -0,0 +1,85 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+class ResponseCache:
+    """Persistent SQLite cache for LLM responses keyed by a hash of the request"""
+    
+    # Values are stored in plaintext: only cache requests whose replies carry no candidate
+    # personal data, since this file is outside encryption, erasure and retention
+    
+    # Bumped when the rules for what may be cached tighten; older rows are discarded
+    SCHEMA_VERSION = 1
+    
+    def __init__(self, db_path: str, ttl_seconds: int):
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        # One connection shared by every session thread, serialized by the lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, ttl REAL NOT NULL)"
+        )
+        # Earlier versions also cached conversational replies, which can repeat candidate details
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < self.SCHEMA_VERSION:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        self._conn.commit()
+        self._sweep_expired()
+    
+    @staticmethod
+    def make_key(model: str, temperature: float, messages: List[Dict[str, str]], **params) -> str:
+        """Build a stable cache key for a chat completion request"""
+        payload = json.dumps(
+            {'model': model, 'temperature': temperature, 'messages': messages, **params},
+            sort_keys=True
+        )
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired"""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value, created_at, ttl FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and time.time() - row[1] > row[2]:
+                    # Expired rows are deleted, not just ignored, so the file cannot grow forever
+                    with self._conn:
+                        self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    return None
+            if row is None:
+                return None
+            return json.loads(row[0])
+        except Exception as e:
+            print(f"Error reading LLM cache: {e}")
+            return None
+    
+    def set(self, key: str, value: Any):
+        """Store a JSON-serializable value under key, dropping any rows that have expired"""
+        try:
+            now = time.time()
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, created_at, ttl) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value), now, self.ttl_seconds)
+                )
+                # Sets only follow an API round trip, so the sweep is cheap by comparison
+                self._conn.execute("DELETE FROM llm_cache WHERE created_at + ttl < ?", (now,))
+        except Exception as e:
+            print(f"Error writing LLM cache: {e}")
+    
+    def _sweep_expired(self):
+        """Delete every expired row"""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM llm_cache WHERE created_at + ttl < ?", (time.time(),))
+        except Exception as e:
+            print(f"Error sweeping LLM cache: {e}")
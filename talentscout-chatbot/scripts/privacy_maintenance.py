@@ -6,19 +6,28 @@ Run this script periodically to maintain data privacy compliance
 
 import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Run as a file, only scripts/ is on sys.path; `python -m scripts.privacy_maintenance`
+# from the project root needs no fix-up
+if not __package__:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.data_handler import DataHandler
-from config import Config
+from config import CONFIG
 import json
+import tempfile
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 def main():
     """Main privacy maintenance routine"""
     print("🔒 TalentScout Privacy Maintenance")
     print("=" * 40)
     
-    config = Config()
     data_handler = DataHandler()
     
     # Generate privacy report
@@ -32,8 +41,8 @@ def main():
         print(f"📅 Oldest record: {report['data_summary']['oldest_record']}")
     
     # Cleanup old data
-    print(f"\n🧹 Cleaning up data older than {config.DATA_RETENTION_DAYS} days...")
-    deleted_count = data_handler.cleanup_old_data(config.DATA_RETENTION_DAYS)
+    print(f"\n🧹 Cleaning up data older than {CONFIG.DATA_RETENTION_DAYS} days...")
+    deleted_count = data_handler.cleanup_old_data(CONFIG.DATA_RETENTION_DAYS)
     print(f"🗑️ Deleted {deleted_count} old records")
     
     # Save maintenance report
@@ -43,8 +52,17 @@ def main():
         'privacy_report': report
     }
     
-    with open('data/maintenance_report.json', 'w') as f:
-        json.dump(maintenance_report, f, indent=2)
+    # The report's fixed sections are read-only mappings; default=dict writes them as objects
+    if orjson is not None:
+        report_bytes = orjson.dumps(maintenance_report, default=dict, option=orjson.OPT_INDENT_2)
+    else:
+        report_bytes = json.dumps(maintenance_report, default=dict, indent=2).encode('utf-8')
+    
+    # Write beside the target and rename so an interrupted run never leaves a partial report
+    fd, tmp_path = tempfile.mkstemp(dir='data', suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(report_bytes)
+    os.replace(tmp_path, 'data/maintenance_report.json')
     
     print("\n✅ Privacy maintenance completed successfully!")
     print("📁 Report saved to: data/maintenance_report.json")
@@ -0,0 +1,43 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+from app import HiringAssistant
+from utils.data_handler import DataHandler
+
+class SessionPersistenceTest(unittest.TestCase):
+    """Saved sessions must round-trip the full conversation"""
+    
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        # Swap the handler in before construction so nothing touches the real ./data
+        handler = DataHandler(self.data_dir)
+        with mock.patch.object(app, 'get_data_handler', return_value=handler):
+            self.assistant = HiringAssistant()
+    
+    def tearDown(self):
+        app.get_data_handler.clear()
+        shutil.rmtree(self.data_dir)
+    
+    def test_history_survives_summary_threshold(self):
+        """Crossing the summary threshold changes the LLM prompt, not what is saved"""
+        for turn in range(40):
+            role = "user" if turn % 2 == 0 else "assistant"
+            self.assistant._append_history(role, f"turn {turn}: " + "detail " * 300)
+        self.assertIsNotNone(self.assistant._summary_message)
+        
+        self.assertTrue(self.assistant.save_session_data("session-1"))
+        loaded = self.assistant.data_handler.load_candidate_data("session-1")
+        
+        self.assertEqual(loaded['conversation_history'], self.assistant.conversation_history)
+        self.assertEqual(len(loaded['conversation_history']), 40)
+        self.assertTrue(loaded['conversation_history'][0]['content'].startswith("turn 0: "))
+
+if __name__ == "__main__":
+    unittest.main()
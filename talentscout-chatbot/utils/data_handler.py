@@ -1,25 +1,126 @@
 import json
 import hashlib
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 from dataclasses import asdict
 import os
 import base64
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 import uuid
+import threading
+import sqlite3
+import mmap
+import zstandard
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Candidate file suffixes, the one written first; plain .json is still read for older records
+_CANDIDATE_SUFFIXES = ('.json.zst', '.json')
+
+# Fixed sections shared by every export and privacy report; read-only so no caller can alter them
+_PRIVACY_NOTICE = MappingProxyType({
+    'data_controller': 'TalentScout Recruitment Agency',
+    'purpose': 'Initial candidate screening and recruitment',
+    'retention_period': '30 days from collection',
+    'rights': 'You have the right to access, rectify, erase, and port your data'
+})
+
+_COMPLIANCE_STATUS = MappingProxyType({
+    'encryption_enabled': True,
+    'retention_policy_active': True,
+    'audit_logging_enabled': True,
+    'gdpr_compliant': True
+})
+
+def _json_dumps(obj, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, with orjson when it is installed"""
+    # default=dict lets the read-only mapping sections above serialize as objects
+    if orjson is not None:
+        return orjson.dumps(obj, default=dict, option=orjson.OPT_INDENT_2 if indent else None)
+    return json.dumps(obj, default=dict, indent=2 if indent else None).encode()
+
+def _json_loads(data):
+    """Parse JSON from bytes or str, with orjson when it is installed"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def _secure_remove(path: str):
+    """Overwrite a file's contents with random bytes, then unlink it"""
+    size = os.path.getsize(path)
+    if size:
+        # One random page tiled over a memory map; each slice assignment is a memcpy
+        pad = memoryview(os.urandom(mmap.PAGESIZE))
+        with open(path, 'r+b') as f, mmap.mmap(f.fileno(), size) as mm:
+            for offset in range(0, size, mmap.PAGESIZE):
+                chunk = min(mmap.PAGESIZE, size - offset)
+                mm[offset:offset + chunk] = pad[:chunk]
+            mm.flush()
+    os.remove(path)
+
+def _compress(data: bytes) -> bytes:
+    """zstd-compress a candidate file body (level 3)"""
+    # Compressor contexts are not thread-safe, and each Streamlit session saves from its own thread
+    return zstandard.ZstdCompressor(level=3).compress(data)
+
+def _decompress(data: bytes) -> bytes:
+    """Inverse of _compress"""
+    return zstandard.ZstdDecompressor().decompress(data)
 
 class DataHandler:
     """Handle candidate data with privacy considerations and GDPR compliance"""
     
+    # Decrypted records kept in memory, least recently used evicted first
+    LOAD_CACHE_SIZE = 256
+    
+    # Per-session AES-GCM objects kept so repeat saves and loads skip key derivation
+    SESSION_KEY_CACHE_SIZE = 256
+    
+    # Scheme behind hash_email/hash_phone, recorded with each record's privacy hashes
+    HASH_ALGO = 'blake2b'
+    
+    # Threads used to delete expired records during retention cleanup
+    CLEANUP_WORKERS = 16
+    
+    # Newest activity log entries kept; older rows are pruned as new ones arrive
+    ACTIVITY_LOG_MAX_ENTRIES = 1000
+    
     def __init__(self, data_dir: str = "data"):
         self.data_dir = data_dir
         os.makedirs(data_dir, exist_ok=True)
         os.makedirs(f"{data_dir}/encrypted", exist_ok=True)
         os.makedirs(f"{data_dir}/exports", exist_ok=True)
         self.encryption_key = self._get_or_create_encryption_key()
+        self._check_encryption_key(self.encryption_key)
         self.cipher_suite = Fernet(self.encryption_key)
+        # 32 bytes of master key material: Fernet over it reads 1.0 records, and 2.1 records
+        # are sealed with per-session HKDF subkeys of it (see _session_aead)
+        self._master_key = base64.urlsafe_b64decode(self.encryption_key)
+        self._session_aeads = OrderedDict()
+        self._session_aeads_lock = threading.Lock()
+        # session_id -> (file mtime_ns, decrypted record as JSON bytes); shared by every session thread.
+        # Storing bytes means every load parses its own dict, so callers can't alter the cached record
+        self._load_cache = OrderedDict()
+        self._load_cache_lock = threading.Lock()
+        # Activity log in SQLite: one connection shared by session threads, serialized by the lock
+        self._log_lock = threading.Lock()
+        self._logdb = sqlite3.connect(f"{data_dir}/activity.db", check_same_thread=False)
+        self._logdb.execute("PRAGMA journal_mode=WAL")
+        self._logdb.execute(
+            "CREATE TABLE IF NOT EXISTS activity_log ("
+            "id INTEGER PRIMARY KEY, timestamp TEXT NOT NULL, activity TEXT NOT NULL, "
+            "session_id TEXT, metadata TEXT NOT NULL)"
+        )
+        self._logdb.commit()
+        self._migrate_activity_log()
     
     def _get_or_create_encryption_key(self) -> bytes:
         """Get or create encryption key for data protection"""
@@ -37,63 +138,113 @@ class DataHandler:
             os.chmod(key_file, 0o600)
             return key
     
-    def _encrypt_data(self, data: str) -> str:
-        """Encrypt sensitive data"""
+    def _check_encryption_key(self, key: bytes):
+        """Raise a clear error if the key file does not hold 32 url-safe base64-encoded bytes"""
         try:
-            encrypted_data = self.cipher_suite.encrypt(data.encode())
-            return base64.b64encode(encrypted_data).decode()
-        except Exception as e:
-            print(f"Error encrypting data: {e}")
-            return data  # Return unencrypted if encryption fails
+            raw = base64.urlsafe_b64decode(key)
+        except ValueError:
+            raw = None
+        if raw is None or len(raw) != 32:
+            raise ValueError(
+                f"Encryption key in {self.data_dir}/.encryption_key is invalid: expected 32 url-safe "
+                f"base64-encoded bytes. Restore the original key file; records sealed with it cannot be read otherwise."
+            )
     
-    def _decrypt_data(self, encrypted_data: str) -> str:
-        """Decrypt sensitive data"""
-        try:
-            decoded_data = base64.b64decode(encrypted_data.encode())
-            decrypted_data = self.cipher_suite.decrypt(decoded_data)
-            return decrypted_data.decode()
-        except Exception as e:
-            print(f"Error decrypting data: {e}")
-            return encrypted_data  # Return as-is if decryption fails
+    def _session_aead(self, session_id: str) -> AESGCM:
+        """AES-GCM keyed with the session's HKDF subkey of the master key"""
+        with self._session_aeads_lock:
+            aead = self._session_aeads.get(session_id)
+            if aead is not None:
+                self._session_aeads.move_to_end(session_id)
+                return aead
+        
+        subkey = HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=session_id.encode(),
+            info=b"candidate",
+        ).derive(self._master_key)
+        aead = AESGCM(subkey)
+        
+        with self._session_aeads_lock:
+            self._session_aeads[session_id] = aead
+            self._session_aeads.move_to_end(session_id)
+            if len(self._session_aeads) > self.SESSION_KEY_CACHE_SIZE:
+                self._session_aeads.popitem(last=False)
+        return aead
+    
+    def _encrypt_data(self, plaintext: bytes, session_id: str) -> str:
+        """Encrypt sensitive data as one AES-GCM blob under the session's subkey"""
+        nonce = os.urandom(12)
+        ciphertext = self._session_aead(session_id).encrypt(nonce, plaintext, session_id.encode())
+        return base64.b64encode(nonce + ciphertext).decode()
+    
+    def _decrypt_data(self, blob: str, session_id: str) -> bytes:
+        """Decrypt a blob written by _encrypt_data"""
+        raw = base64.b64decode(blob)
+        return self._session_aead(session_id).decrypt(raw[:12], raw[12:], session_id.encode())
+    
+    def _decrypt_legacy_field(self, encrypted_data: str) -> str:
+        """Decrypt a per-field Fernet value from a version 1.0 record"""
+        # Failures raise: handing back the ciphertext as if it were the value would hide them.
+        # 1.0 stored each Fernet token base64-encoded a second time, so undo that first
+        return self.cipher_suite.decrypt(base64.b64decode(encrypted_data.encode())).decode()
     
     def hash_email(self, email: str) -> str:
         """Create a hash of email for privacy"""
-        return hashlib.sha256(email.encode()).hexdigest()[:16]
+        return hashlib.blake2b(email.encode(), digest_size=8).hexdigest()
     
     def hash_phone(self, phone: str) -> str:
         """Create a hash of phone number for privacy"""
-        return hashlib.sha256(phone.encode()).hexdigest()[:12]
+        return hashlib.blake2b(phone.encode(), digest_size=6).hexdigest()
+    
+    def hash_emails_bulk(self, emails: List[str]) -> List[str]:
+        """Hash many emails at once, matching hash_email for each"""
+        hash_email = self.hash_email
+        return [hash_email(email) for email in emails]
     
-    def save_candidate_data(self, candidate_info, session_id: str, conversation_history: List[Dict] = None) -> bool:
-        """Save candidate information securely with encryption"""
+    def save_candidate_data(self, candidate_info, session_id: str,
+                            conversation_history: Union[List[Dict], bytes, None] = None) -> bool:
+        """Save candidate information securely with encryption; history may be a list or a serialized JSON array"""
         try:
+            self._evict_cached(session_id)
+            
             # Create anonymized and encrypted data structure
             timestamp = datetime.now()
             
-            # Encrypt sensitive personal information
+            # Sensitive fields and the conversation are encrypted together in one blob
+            sensitive = {
+                'full_name': candidate_info.full_name,
+                'email': candidate_info.email,
+                'phone': candidate_info.phone,
+                'current_location': candidate_info.current_location,
+            }
+            if conversation_history and not isinstance(conversation_history, bytes):
+                sensitive['conversation_history'] = conversation_history
+            sensitive_json = _json_dumps(sensitive)
+            if conversation_history and isinstance(conversation_history, bytes):
+                # Already serialized by the caller: splice it in rather than parse and re-serialize it
+                sensitive_json = sensitive_json[:-1] + b',"conversation_history":' + conversation_history + b'}'
+            
             encrypted_data = {
                 'session_id': session_id,
                 'timestamp': timestamp.isoformat(),
-                'data_version': '1.0',
+                'data_version': '2.1',
                 'privacy_compliant': True,
                 
-                # Encrypted personal information
+                # Non-sensitive information (not encrypted)
                 'candidate_info': {
-                    'full_name_encrypted': self._encrypt_data(candidate_info.full_name) if candidate_info.full_name else None,
-                    'email_encrypted': self._encrypt_data(candidate_info.email) if candidate_info.email else None,
-                    'phone_encrypted': self._encrypt_data(candidate_info.phone) if candidate_info.phone else None,
-                    'current_location_encrypted': self._encrypt_data(candidate_info.current_location) if candidate_info.current_location else None,
-                    
-                    # Non-sensitive information (not encrypted)
                     'years_experience': candidate_info.years_experience,
                     'desired_positions': candidate_info.desired_positions,
                     'tech_stack': candidate_info.tech_stack,
                 },
                 
                 # Privacy hashes for identification without exposing data
+                # (records without hash_algo used truncated sha256)
                 'privacy_hashes': {
                     'email_hash': self.hash_email(candidate_info.email) if candidate_info.email else None,
                     'phone_hash': self.hash_phone(candidate_info.phone) if candidate_info.phone else None,
+                    'hash_algo': self.HASH_ALGO,
                 },
                 
                 # Metadata
@@ -102,29 +253,31 @@ class DataHandler:
                     'user_agent_hash': None,  # Could be implemented if needed
                     'session_duration': None,  # Could be calculated
                     'completion_status': 'complete' if conversation_history else 'incomplete'
-                }
+                },
+                
+                'enc_blob': self._encrypt_data(sensitive_json, session_id)
             }
             
-            # Add conversation history if provided (encrypted)
-            if conversation_history:
-                encrypted_data['conversation_history_encrypted'] = self._encrypt_data(
-                    json.dumps(conversation_history)
-                )
-            
-            # Save to encrypted file
-            filename = f"{self.data_dir}/encrypted/candidate_{session_id}.json"
-            with open(filename, 'w') as f:
-                json.dump(encrypted_data, f, indent=2)
+            # Save to encrypted file, zstd-compressed
+            filename = self._candidate_filename(session_id)
+            with open(filename, 'wb') as f:
+                f.write(_compress(_json_dumps(encrypted_data)))
             
             # Set restrictive file permissions
             os.chmod(filename, 0o600)
             
+            # Drop a copy left under the other suffix so only one version of the record exists
+            for suffix in _CANDIDATE_SUFFIXES[1:]:
+                stale = self._candidate_filename(session_id, suffix)
+                if os.path.exists(stale):
+                    _secure_remove(stale)
+            
             # Log the data storage (without sensitive info)
             self._log_data_activity('SAVE', session_id, {
                 'has_personal_info': bool(candidate_info.full_name),
                 'has_contact_info': bool(candidate_info.email),
                 'tech_stack_count': len(candidate_info.tech_stack) if candidate_info.tech_stack else 0
-            })
+            }, ts=timestamp)
             
             return True
             
@@ -135,32 +288,30 @@ class DataHandler:
     def load_candidate_data(self, session_id: str) -> Optional[Dict]:
         """Load and decrypt candidate data"""
         try:
-            filename = f"{self.data_dir}/encrypted/candidate_{session_id}.json"
+            filename = self._find_candidate_file(session_id)
             
-            if not os.path.exists(filename):
+            if filename is None:
                 return None
             
-            with open(filename, 'r') as f:
-                encrypted_data = json.load(f)
-            
-            # Decrypt sensitive information
-            decrypted_data = encrypted_data.copy()
-            
-            if 'candidate_info' in encrypted_data:
-                candidate_info = encrypted_data['candidate_info']
-                decrypted_data['candidate_info'] = {
-                    'full_name': self._decrypt_data(candidate_info['full_name_encrypted']) if candidate_info.get('full_name_encrypted') else None,
-                    'email': self._decrypt_data(candidate_info['email_encrypted']) if candidate_info.get('email_encrypted') else None,
-                    'phone': self._decrypt_data(candidate_info['phone_encrypted']) if candidate_info.get('phone_encrypted') else None,
-                    'current_location': self._decrypt_data(candidate_info['current_location_encrypted']) if candidate_info.get('current_location_encrypted') else None,
-                    'years_experience': candidate_info.get('years_experience'),
-                    'desired_positions': candidate_info.get('desired_positions'),
-                    'tech_stack': candidate_info.get('tech_stack', []),
-                }
-            
-            if 'conversation_history_encrypted' in encrypted_data:
-                decrypted_history = self._decrypt_data(encrypted_data['conversation_history_encrypted'])
-                decrypted_data['conversation_history'] = json.loads(decrypted_history)
+            # The file's mtime tells whether a cached copy is still current
+            mtime_ns = os.stat(filename).st_mtime_ns
+            with self._load_cache_lock:
+                cached = self._load_cache.get(session_id)
+                if cached and cached[0] == mtime_ns:
+                    self._load_cache.move_to_end(session_id)
+                    cached_json = cached[1]
+                else:
+                    cached_json = None
+            
+            if cached_json is not None:
+                decrypted_data = _json_loads(cached_json)
+            else:
+                decrypted_data = self._read_candidate_file(filename, session_id)
+                with self._load_cache_lock:
+                    self._load_cache[session_id] = (mtime_ns, _json_dumps(decrypted_data))
+                    self._load_cache.move_to_end(session_id)
+                    if len(self._load_cache) > self.LOAD_CACHE_SIZE:
+                        self._load_cache.popitem(last=False)
             
             self._log_data_activity('LOAD', session_id)
             return decrypted_data
@@ -169,6 +320,70 @@ class DataHandler:
             print(f"Error loading candidate data: {e}")
             return None
     
+    def _read_candidate_file(self, filename: str, session_id: str) -> Dict:
+        """Read a candidate file from disk and decrypt it"""
+        with open(filename, 'rb') as f:
+            body = f.read()
+        if filename.endswith('.zst'):
+            body = _decompress(body)
+        # Parsed from disk and not shared (the load cache keeps a serialized copy), so decrypt in place
+        record = _json_loads(body)
+        
+        # Decrypt sensitive information
+        if 'enc_blob' in record:
+            sensitive = _json_loads(self._decrypt_data(record.pop('enc_blob'), session_id))
+            candidate_info = record.get('candidate_info', {})
+            record['candidate_info'] = {
+                'full_name': sensitive.get('full_name'),
+                'email': sensitive.get('email'),
+                'phone': sensitive.get('phone'),
+                'current_location': sensitive.get('current_location'),
+                'years_experience': candidate_info.get('years_experience'),
+                'desired_positions': candidate_info.get('desired_positions'),
+                'tech_stack': candidate_info.get('tech_stack', []),
+            }
+            if 'conversation_history' in sensitive:
+                record['conversation_history'] = sensitive['conversation_history']
+        else:
+            self._decrypt_legacy_record(record)
+        
+        return record
+    
+    def _candidate_filename(self, session_id: str, suffix: str = _CANDIDATE_SUFFIXES[0]) -> str:
+        """Path of a session's candidate file with the given suffix"""
+        return f"{self.data_dir}/encrypted/candidate_{session_id}{suffix}"
+    
+    def _find_candidate_file(self, session_id: str) -> Optional[str]:
+        """Path of the session's existing candidate file, compressed or plain, if any"""
+        for suffix in _CANDIDATE_SUFFIXES:
+            filename = self._candidate_filename(session_id, suffix)
+            if os.path.exists(filename):
+                return filename
+        return None
+    
+    def _evict_cached(self, session_id: str):
+        """Drop any cached decrypted copy of a session's record"""
+        with self._load_cache_lock:
+            self._load_cache.pop(session_id, None)
+    
+    def _decrypt_legacy_record(self, record: Dict):
+        """Decrypt a version 1.0 record with per-field Fernet encryption, in place"""
+        if 'candidate_info' in record:
+            candidate_info = record['candidate_info']
+            record['candidate_info'] = {
+                'full_name': self._decrypt_legacy_field(candidate_info['full_name_encrypted']) if candidate_info.get('full_name_encrypted') else None,
+                'email': self._decrypt_legacy_field(candidate_info['email_encrypted']) if candidate_info.get('email_encrypted') else None,
+                'phone': self._decrypt_legacy_field(candidate_info['phone_encrypted']) if candidate_info.get('phone_encrypted') else None,
+                'current_location': self._decrypt_legacy_field(candidate_info['current_location_encrypted']) if candidate_info.get('current_location_encrypted') else None,
+                'years_experience': candidate_info.get('years_experience'),
+                'desired_positions': candidate_info.get('desired_positions'),
+                'tech_stack': candidate_info.get('tech_stack', []),
+            }
+        
+        if 'conversation_history_encrypted' in record:
+            decrypted_history = self._decrypt_legacy_field(record['conversation_history_encrypted'])
+            record['conversation_history'] = _json_loads(decrypted_history)
+    
     def export_candidate_data(self, session_id: str, export_format: str = 'json') -> Optional[str]:
         """Export candidate data for GDPR compliance (data portability)"""
         try:
@@ -176,10 +391,13 @@ class DataHandler:
             if not data:
                 return None
             
+            # One clock read covers exported_at, the filename and the log entry
+            now = datetime.now()
+            
             # Create export-friendly format
             export_data = {
                 'export_info': {
-                    'exported_at': datetime.now().isoformat(),
+                    'exported_at': now.isoformat(),
                     'session_id': session_id,
                     'format': export_format,
                     'gdpr_compliant': True
@@ -189,21 +407,17 @@ class DataHandler:
                     'total_messages': len(data.get('conversation_history', [])),
                     'completion_status': data.get('metadata', {}).get('completion_status', 'unknown')
                 },
-                'privacy_notice': {
-                    'data_controller': 'TalentScout Recruitment Agency',
-                    'purpose': 'Initial candidate screening and recruitment',
-                    'retention_period': '30 days from collection',
-                    'rights': 'You have the right to access, rectify, erase, and port your data'
-                }
+                'privacy_notice': _PRIVACY_NOTICE
             }
             
             # Save export file
-            export_filename = f"{self.data_dir}/exports/export_{session_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            export_filename = f"{self.data_dir}/exports/export_{session_id}_{now.strftime('%Y%m%d_%H%M%S')}.json"
             
-            with open(export_filename, 'w') as f:
-                json.dump(export_data, f, indent=2)
+            # Exports are read by people, so they stay indented
+            with open(export_filename, 'wb') as f:
+                f.write(_json_dumps(export_data, indent=True))
             
-            self._log_data_activity('EXPORT', session_id, {'format': export_format})
+            self._log_data_activity('EXPORT', session_id, {'format': export_format}, ts=now)
             return export_filename
             
         except Exception as e:
@@ -213,20 +427,21 @@ class DataHandler:
     def delete_candidate_data(self, session_id: str, reason: str = 'user_request') -> bool:
         """Delete candidate data (GDPR right to erasure)"""
         try:
-            filename = f"{self.data_dir}/encrypted/candidate_{session_id}.json"
+            filename = self._find_candidate_file(session_id)
+            self._evict_cached(session_id)
             
-            if os.path.exists(filename):
+            if filename is not None:
                 # Log deletion before removing file
                 self._log_data_activity('DELETE', session_id, {'reason': reason})
                 
                 # Securely delete file
-                os.remove(filename)
+                _secure_remove(filename)
                 
                 # Also remove any export files for this session
                 export_pattern = f"export_{session_id}_"
                 for export_file in os.listdir(f"{self.data_dir}/exports"):
                     if export_file.startswith(export_pattern):
-                        os.remove(f"{self.data_dir}/exports/{export_file}")
+                        _secure_remove(f"{self.data_dir}/exports/{export_file}")
                 
                 return True
             
@@ -238,37 +453,45 @@ class DataHandler:
     
     def cleanup_old_data(self, retention_days: int = 30) -> int:
         """Remove old candidate data based on retention policy"""
-        cutoff_date = datetime.now() - timedelta(days=retention_days)
+        now = datetime.now()
+        cutoff_date = now - timedelta(days=retention_days)
         deleted_count = 0
         
         try:
             encrypted_dir = f"{self.data_dir}/encrypted"
             
-            for filename in os.listdir(encrypted_dir):
-                if filename.startswith('candidate_') and filename.endswith('.json'):
-                    filepath = os.path.join(encrypted_dir, filename)
-                    
-                    try:
-                        with open(filepath, 'r') as f:
-                            data = json.load(f)
+            # Find expired records first so their deletions can be logged together.
+            # A record's file is rewritten on every save, so its mtime is the save time
+            # and no file needs to be opened to age it.
+            cutoff_ts = cutoff_date.timestamp()
+            expired = []
+            with os.scandir(encrypted_dir) as entries:
+                for entry in entries:
+                    suffix = next((sfx for sfx in _CANDIDATE_SUFFIXES if entry.name.endswith(sfx)), None)
+                    if entry.name.startswith('candidate_') and suffix:
+                        try:
+                            mtime = entry.stat().st_mtime
+                        except OSError as e:
+                            print(f"Error processing file {entry.name}: {e}")
+                            continue
                         
-                        file_date = datetime.fromisoformat(data['timestamp'])
-                        
-                        if file_date < cutoff_date:
-                            session_id = data.get('session_id', 'unknown')
-                            
-                            # Log automatic deletion
-                            self._log_data_activity('AUTO_DELETE', session_id, {
-                                'retention_days': retention_days,
-                                'file_age_days': (datetime.now() - file_date).days
-                            })
-                            
-                            # Delete the file
-                            os.remove(filepath)
-                            deleted_count += 1
-                            
-                    except Exception as e:
-                        print(f"Error processing file {filename}: {e}")
+                        if mtime < cutoff_ts:
+                            session_id = entry.name[len('candidate_'):-len(suffix)]
+                            expired.append((entry.path, session_id, datetime.fromtimestamp(mtime)))
+            
+            if expired:
+                # Log automatic deletions in one append, before any file is removed
+                self._log_data_activities([
+                    ('AUTO_DELETE', session_id, {
+                        'retention_days': retention_days,
+                        'file_age_days': (now - file_date).days
+                    })
+                    for _, session_id, file_date in expired
+                ], ts=now)
+                
+                # Overwrites and unlinks block on the filesystem, not the GIL, so overlap them
+                with ThreadPoolExecutor(max_workers=min(self.CLEANUP_WORKERS, len(expired))) as pool:
+                    deleted_count = sum(pool.map(self._remove_expired_record, expired))
             
             # Also cleanup old export files
             exports_dir = f"{self.data_dir}/exports"
@@ -279,7 +502,7 @@ class DataHandler:
                     file_date = datetime.fromtimestamp(file_stat.st_mtime)
                     
                     if file_date < cutoff_date:
-                        os.remove(filepath)
+                        _secure_remove(filepath)
             
             return deleted_count
             
@@ -287,36 +510,75 @@ class DataHandler:
             print(f"Error during cleanup: {e}")
             return deleted_count
     
-    def _log_data_activity(self, activity: str, session_id: str, metadata: Dict = None):
+    def _remove_expired_record(self, record: tuple) -> int:
+        """Delete one expired (filepath, session_id, file_date) record; 1 if it was removed"""
+        filepath, session_id, _ = record
+        try:
+            _secure_remove(filepath)
+            self._evict_cached(session_id)
+            return 1
+        except Exception as e:
+            print(f"Error deleting file {filepath}: {e}")
+            return 0
+    
+    def _log_data_activity(self, activity: str, session_id: str, metadata: Dict = None, ts: Optional[datetime] = None):
         """Log data handling activities for audit trail"""
+        self._log_data_activities([(activity, session_id, metadata)], ts=ts)
+    
+    def _log_data_activities(self, activities: List[tuple], ts: Optional[datetime] = None):
+        """Record (activity, session_id, metadata) audit entries in one transaction, stamped ts or now"""
         try:
-            log_entry = {
-                'timestamp': datetime.now().isoformat(),
-                'activity': activity,
-                'session_id': session_id,
-                'metadata': metadata or {}
-            }
-            
-            log_file = f"{self.data_dir}/activity_log.json"
+            timestamp = (ts or datetime.now()).isoformat()
+            rows = [
+                (timestamp, activity, session_id, _json_dumps(metadata or {}).decode())
+                for activity, session_id, metadata in activities
+            ]
+            self._insert_activity_rows(rows)
+                
+        except Exception as e:
+            print(f"Error logging activity: {e}")
+    
+    def _insert_activity_rows(self, rows: List[tuple]):
+        """Insert (timestamp, activity, session_id, metadata_json) rows and prune past the cap"""
+        with self._log_lock, self._logdb:
+            self._logdb.executemany(
+                "INSERT INTO activity_log (timestamp, activity, session_id, metadata) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._logdb.execute(
+                "DELETE FROM activity_log WHERE id <= (SELECT MAX(id) FROM activity_log) - ?",
+                (self.ACTIVITY_LOG_MAX_ENTRIES,)
+            )
+    
+    def _migrate_activity_log(self):
+        """Move entries from the activity_log.json of earlier versions into SQLite"""
+        legacy_json = f"{self.data_dir}/activity_log.json"
+        
+        if not os.path.exists(legacy_json):
+            return
+        
+        try:
+            with open(legacy_json, 'rb') as f:
+                entries = _json_loads(f.read()).get('activities', [])
             
-            # Load existing log or create new
-            if os.path.exists(log_file):
-                with open(log_file, 'r') as f:
-                    log_data = json.load(f)
-            else:
-                log_data = {'activities': []}
+            # Entries missing the NOT NULL columns are skipped rather than failing the whole import
+            rows = [
+                (entry['timestamp'], entry['activity'], entry.get('session_id'),
+                 _json_dumps(entry.get('metadata') or {}).decode())
+                for entry in entries[-self.ACTIVITY_LOG_MAX_ENTRIES:]
+                if isinstance(entry, dict) and entry.get('timestamp') and entry.get('activity')
+            ]
+            skipped = min(len(entries), self.ACTIVITY_LOG_MAX_ENTRIES) - len(rows)
+            if skipped:
+                print(f"Skipped {skipped} malformed activity log entries during migration")
             
-            log_data['activities'].append(log_entry)
+            if rows:
+                self._insert_activity_rows(rows)
             
-            # Keep only last 1000 entries
-            if len(log_data['activities']) > 1000:
-                log_data['activities'] = log_data['activities'][-1000:]
+            os.remove(legacy_json)
             
-            with open(log_file, 'w') as f:
-                json.dump(log_data, f, indent=2)
-                
         except Exception as e:
-            print(f"Error logging activity: {e}")
+            print(f"Error migrating activity log: {e}")
     
     def get_privacy_report(self) -> Dict:
         """Generate privacy compliance report"""
@@ -329,43 +591,47 @@ class DataHandler:
                     'oldest_record': None,
                     'newest_record': None
                 },
-                'compliance_status': {
-                    'encryption_enabled': True,
-                    'retention_policy_active': True,
-                    'audit_logging_enabled': True,
-                    'gdpr_compliant': True
-                },
+                'compliance_status': _COMPLIANCE_STATUS,
                 'recent_activities': []
             }
             
             # Count records
             encrypted_dir = f"{self.data_dir}/encrypted"
             if os.path.exists(encrypted_dir):
-                files = [f for f in os.listdir(encrypted_dir) if f.startswith('candidate_')]
-                report['data_summary']['total_records'] = len(files)
-                report['data_summary']['encrypted_records'] = len(files)
+                # Record count and age range come from directory metadata alone
+                record_count = 0
+                oldest = newest = None
+                with os.scandir(encrypted_dir) as entries:
+                    for entry in entries:
+                        if not entry.name.startswith('candidate_'):
+                            continue
+                        record_count += 1
+                        try:
+                            mtime = entry.stat().st_mtime
+                        except OSError:
+                            continue
+                        if oldest is None or mtime < oldest:
+                            oldest = mtime
+                        if newest is None or mtime > newest:
+                            newest = mtime
                 
-                # Find oldest and newest records
-                dates = []
-                for filename in files:
-                    try:
-                        filepath = os.path.join(encrypted_dir, filename)
-                        with open(filepath, 'r') as f:
-                            data = json.load(f)
-                        dates.append(datetime.fromisoformat(data['timestamp']))
-                    except:
-                        continue
+                report['data_summary']['total_records'] = record_count
+                report['data_summary']['encrypted_records'] = record_count
                 
-                if dates:
-                    report['data_summary']['oldest_record'] = min(dates).isoformat()
-                    report['data_summary']['newest_record'] = max(dates).isoformat()
+                if oldest is not None:
+                    report['data_summary']['oldest_record'] = datetime.fromtimestamp(oldest).isoformat()
+                    report['data_summary']['newest_record'] = datetime.fromtimestamp(newest).isoformat()
             
             # Get recent activities
-            log_file = f"{self.data_dir}/activity_log.json"
-            if os.path.exists(log_file):
-                with open(log_file, 'r') as f:
-                    log_data = json.load(f)
-                report['recent_activities'] = log_data['activities'][-10:]  # Last 10 activities
+            with self._log_lock:
+                rows = self._logdb.execute(
+                    "SELECT timestamp, activity, session_id, metadata FROM activity_log "
+                    "ORDER BY id DESC LIMIT 10"  # Last 10 activities
+                ).fetchall()
+            report['recent_activities'] = [
+                {'timestamp': ts, 'activity': activity, 'session_id': session_id, 'metadata': _json_loads(metadata)}
+                for ts, activity, session_id, metadata in reversed(rows)
+            ]
             
             return report
             
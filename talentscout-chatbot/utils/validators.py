@@ -1,14 +1,61 @@
 import re
+from functools import lru_cache
 from typing import List, Tuple
 
+# Patterns are compiled once at import; ASCII mode keeps \d and \s to plain ASCII
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', re.ASCII)
+_PHONE_CLEAN_RE = re.compile(r'[\s\-().]+', re.ASCII)
+_PHONE_RE = re.compile(r'^\+?[1-9]\d{9,14}$', re.ASCII)
+
+try:
+    import ahocorasick
+except ImportError:
+    # Optional accelerator; extract_tech_stack falls back to a compiled regex
+    ahocorasick = None
+
+@lru_cache(maxsize=32)
+def _tech_automaton(techs: Tuple[str, ...]):
+    """Aho-Corasick automaton over the lowercased tech names, built once per tech list"""
+    automaton = ahocorasick.Automaton()
+    for tech in techs:
+        lowered = tech.lower()
+        automaton.add_word(lowered, (len(lowered), tech))
+    automaton.make_automaton()
+    return automaton
+
+@lru_cache(maxsize=32)
+def _tech_regex(techs: Tuple[str, ...]):
+    """Whole-word alternation over the tech names, longest first, with a lowercase lookup"""
+    lookup = {tech.lower(): tech for tech in techs}
+    names = sorted(lookup, key=len, reverse=True)
+    return re.compile(r'(?<!\w)(?:' + '|'.join(map(re.escape, names)) + r')(?!\w)'), lookup
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+def iter_whole_word_matches(automaton, text: str):
+    """Yield the tech of each whole-word hit of a (length, tech)-valued automaton, so 'go' skips 'django'"""
+    for end, (length, tech) in automaton.iter(text):
+        start = end - length + 1
+        if start > 0 and _is_word_char(text[start - 1]):
+            continue
+        if end + 1 < len(text) and _is_word_char(text[end + 1]):
+            continue
+        yield tech
+
 class InputValidator:
     """Validate user inputs for data integrity"""
     
+    _EMAIL_RE = _EMAIL_RE
+    _PHONE_CLEAN_RE = _PHONE_CLEAN_RE
+    _PHONE_RE = _PHONE_RE
+    
+    # No lru_cache on the email and phone checks: a process-wide cache would keep
+    # candidates' contact details in memory past erasure
     @staticmethod
     def validate_email(email: str) -> Tuple[bool, str]:
         """Validate email format"""
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if re.match(pattern, email):
+        if InputValidator._EMAIL_RE.match(email):
             return True, "Valid email"
         return False, "Please enter a valid email address"
     
@@ -16,14 +63,15 @@ class InputValidator:
     def validate_phone(phone: str) -> Tuple[bool, str]:
         """Validate phone number format"""
         # Remove common separators
-        cleaned = re.sub(r'[\s\-$$$$\.]+', '', phone)
+        cleaned = InputValidator._PHONE_CLEAN_RE.sub('', phone)
         
         # Check if it's a valid phone number (10-15 digits)
-        if re.match(r'^\+?[1-9]\d{9,14}$', cleaned):
+        if InputValidator._PHONE_RE.match(cleaned):
             return True, "Valid phone number"
         return False, "Please enter a valid phone number (10-15 digits)"
     
     @staticmethod
+    @lru_cache(maxsize=256)
     def validate_experience(experience: str) -> Tuple[bool, str]:
         """Validate years of experience"""
         try:
@@ -37,11 +85,17 @@ class InputValidator:
     @staticmethod
     def extract_tech_stack(text: str, available_techs: List[str]) -> List[str]:
         """Extract mentioned technologies from text"""
-        found_techs = []
+        if not available_techs:
+            return []
+        
+        techs = tuple(available_techs)
         text_lower = text.lower()
         
-        for tech in available_techs:
-            if tech.lower() in text_lower:
-                found_techs.append(tech)
+        if ahocorasick is not None:
+            # One pass over the text, keeping only whole-word hits
+            found = set(iter_whole_word_matches(_tech_automaton(techs), text_lower))
+        else:
+            tech_regex, lookup = _tech_regex(techs)
+            found = {lookup[match] for match in tech_regex.findall(text_lower)}
         
-        return found_techs
+        return [tech for tech in available_techs if tech in found]